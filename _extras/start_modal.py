@@ -6,16 +6,18 @@ import modal
 
 
 app = modal.App()
-app.image = modal.Image.debian_slim().pip_install(
-    "jupyterlab",
-    "outlines[transformers]",
-    "accelerate>=0.26.0",
-    "numpy",
-    "pandas",
-    "python-dotenv",
-    "langsmith",
-    "scipy",
-    "pydantic",
+# Layers are ordered from least to most likely to change, so bumping a
+# volatile package only rebuilds the layers after it
+app.image = (
+    modal.Image.debian_slim(python_version="3.13")
+    .pip_install("numpy==2.3.1", "pandas==2.3.0", "scipy==1.16.0")
+    .pip_install(
+        "outlines[transformers]==1.0.1",
+        "accelerate==1.8.1",
+        "pydantic==2.11.7",
+    )
+    .pip_install("jupyterlab==4.4.3")
+    .pip_install("langsmith==0.4.13", "python-dotenv==1.1.0")
 )
 
 
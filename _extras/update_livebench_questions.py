@@ -1,11 +1,12 @@
+import re
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
-import instructor
 import numpy as np
 import pandas as pd
-from dotenv import load_dotenv
-from langsmith.wrappers import wrap_openai
-from openai import AsyncOpenAI
+import pyarrow as pa
+import pyarrow.compute as pc
+from pyarrow import json as pajson
 
 data_dir = Path(__file__).parent.parent.parent / "data" / "live_bench"
 reasoning_dir = data_dir / "reasoning"
@@ -14,102 +15,123 @@ language_dir = data_dir / "language"
 
 np.random.seed(42)
 
-load_dotenv()
-langsmith_client = wrap_openai(AsyncOpenAI())
-instructor_client = instructor.from_openai(langsmith_client, mode=instructor.Mode.TOOLS)
-
-
-def process_reasoning_questions():
-    df_reasoning = pd.read_json(reasoning_dir / "question.jsonl", lines=True).assign(
-        turns_str=lambda x: x.turns.str[0],
-        ground_truth=lambda x: x.ground_truth.str.strip(),
-    )
-    assert df_reasoning.turns.str.len().eq(1).all()
-
-    df_reasoning["updated_question"] = (
-        df_reasoning.turns_str.str.replace("in **bold** ", "")
-        .str.replace("***", "")
-        .str.replace("**", "")
-        .str.strip()
-    )
-    df_reasoning.to_json(
-        reasoning_dir / "updated_questions.jsonl", lines=True, orient="records"
-    )
-    df_reasoning.to_csv(reasoning_dir / "updated_questions.csv", index=False)
-
-
-def process_language_questions():
-    df_language = pd.read_json(language_dir / "question.jsonl", lines=True).assign(
-        turns_str=lambda x: x.turns.str[0],
-        ground_truth=lambda x: x.ground_truth.str.strip(),
-    )
-
-    assert df_language.turns.str.len().eq(1).all()
-
-    df_language["updated_question"] = (
-        df_language.turns_str.str.replace(
-            " Begin the plot summary with <PLOT_SUMMARY>.", ""
-        )
-        .str.replace("in **bold** ", "")
-        .str.replace("***", "")
-        .str.replace("**", "")
-        .str.strip()
-    )
-    df_language.to_json(
-        language_dir / "updated_questions.jsonl", lines=True, orient="records"
-    )
-    df_language.to_csv(language_dir / "updated_questions.csv", index=False)
-
-
-def process_math_questions():
-    df_math = (
-        pd.read_json(math_dir / "question.jsonl", lines=True)
-        .query("task != 'AMPS_Hard'")
-        .assign(
-            turns_str=lambda x: x.turns.str[0],
-            ground_truth=lambda x: x.ground_truth.str.strip(),
-        )
-    )
-    df_math["updated_question"] = (
-        df_math.turns_str.str.strip()
-        .str.replace(
-            r" Please put your final answer in a $\\boxed{}$.",
-            "Please think step by step out loud and provide your answer at the end.",
-        )
-        .str.replace(
-            "If you cannot determine the correct multiple-choice answer, take your best guess.",
-            "If you cannot determine the correct answer, take your best guess.",
-        )
-        .str.replace(
-            "Please think step by step, and then display the answer at the very end of your response.",
-            "Please think step by step out loud and provide your answer at the end.",
-        )
-        .str.replace(
-            "Once you have your answer, please duplicate that letter five times in a single string. For example, if the answer is F, then write FFFFF.",
-            "Please think step by step out loud and provide your answer as a single letter (e.g., F or A). Don't include any other text except a single letter in your answer.",
-        )
-        .str.replace(
-            """Your final answer should be STRICTLY in the format:
+MATH_REPLACEMENTS = [
+    (
+        r" Please put your final answer in a $\\boxed{}$.",
+        "Please think step by step out loud and provide your answer at the end.",
+    ),
+    (
+        "If you cannot determine the correct multiple-choice answer, take your best guess.",
+        "If you cannot determine the correct answer, take your best guess.",
+    ),
+    (
+        "Please think step by step, and then display the answer at the very end of your response.",
+        "Please think step by step out loud and provide your answer at the end.",
+    ),
+    (
+        "Once you have your answer, please duplicate that letter five times in a single string. For example, if the answer is F, then write FFFFF.",
+        "Please think step by step out loud and provide your answer as a single letter (e.g., F or A). Don't include any other text except a single letter in your answer.",
+    ),
+    (
+        """Your final answer should be STRICTLY in the format:
 
 <Detailed reasoning>
 
 Answer: <comma separated list of numbers representing expression identifiers>""",
-            "Please think step by step out loud and provide your answer as a comma separated list of numbers representing expression identifiers (e.g., 1,2,3). Don't include any other text except a comma separated list of numbers in your answer.",
-        )
-        .str.replace(
-            "Remember to have the three digits as the last part of the response.",
-            "Your answer should not include any other text except the three digits.",
-        )
-        .str.strip()
+        "Please think step by step out loud and provide your answer as a comma separated list of numbers representing expression identifiers (e.g., 1,2,3). Don't include any other text except a comma separated list of numbers in your answer.",
+    ),
+    (
+        "Remember to have the three digits as the last part of the response.",
+        "Your answer should not include any other text except the three digits.",
+    ),
+]
+
+FORMATTING_REMOVALS = [("in **bold** ", ""), ("***", ""), ("**", "")]
+
+QUESTION_CONFIGS = [
+    {"question_dir": reasoning_dir, "replacements": FORMATTING_REMOVALS},
+    {
+        "question_dir": language_dir,
+        "replacements": [
+            (" Begin the plot summary with <PLOT_SUMMARY>.", ""),
+            *FORMATTING_REMOVALS,
+        ],
+    },
+    {
+        "question_dir": math_dir,
+        "replacements": MATH_REPLACEMENTS,
+        "single_pass": True,
+        "query": "task != 'AMPS_Hard'",
+    },
+]
+
+
+# Only these fields are read: anything else (task-specific extras with mixed
+# JSON types) is ignored, and dates stay plain strings instead of being
+# inferred as timestamps. Fields are listed in LiveBench's own order, which is
+# the key order of the records written back out
+QUESTION_SCHEMA = pa.schema(
+    [
+        ("question_id", pa.string()),
+        ("category", pa.string()),
+        ("ground_truth", pa.string()),
+        ("turns", pa.list_(pa.string())),
+        ("task", pa.string()),
+        ("livebench_release_date", pa.string()),
+        ("livebench_removal_date", pa.string()),
+    ]
+)
+
+
+def read_questions(path):
+    parse_options = pajson.ParseOptions(
+        explicit_schema=QUESTION_SCHEMA, unexpected_field_behavior="ignore"
     )
+    table = pajson.read_json(path, parse_options=parse_options)
+    table = table.append_column("turns_str", pc.list_element(table["turns"], 0))
+    return table.to_pandas(types_mapper=pd.ArrowDtype)
 
-    assert df_math.turns.str.len().eq(1).all()
 
-    df_math.to_json(math_dir / "updated_questions.jsonl", lines=True, orient="records")
-    df_math.to_csv(math_dir / "updated_questions.csv", index=False)
+def replace_substrings(questions, replacements):
+    questions = pa.array(questions, type=pa.string())
+    for pattern, replacement in replacements:
+        questions = pc.replace_substring(
+            questions, pattern=pattern, replacement=replacement
+        )
+    return pd.arrays.ArrowExtensionArray(pc.utf8_trim_whitespace(questions))
+
+
+def replace_in_single_pass(questions, replacements):
+    # One alternation over all the literals, so every question is scanned only
+    # once. Questions are stripped first, as the original math chain did
+    replacements = dict(replacements)
+    pattern = re.compile("|".join(map(re.escape, replacements)))
+    questions = [
+        pattern.sub(
+            lambda match: replacements[match.group(0)], question.strip()
+        ).strip()
+        for question in questions.tolist()
+    ]
+    return pd.arrays.ArrowExtensionArray(pa.array(questions, type=pa.string()))
+
+
+def process_questions(config):
+    question_dir = config["question_dir"]
+    df = read_questions(question_dir / "question.jsonl")
+    if "query" in config:
+        df = df.query(config["query"])
+    df = df.assign(ground_truth=lambda x: x.ground_truth.str.strip())
+
+    assert df.turns.list.len().eq(1).all()
+
+    replace = (
+        replace_in_single_pass if config.get("single_pass") else replace_substrings
+    )
+    df["updated_question"] = replace(df.turns_str, config["replacements"])
+    df.to_json(question_dir / "updated_questions.jsonl", lines=True, orient="records")
 
 
 if __name__ == "__main__":
-    process_reasoning_questions()
-    process_language_questions()
-    process_math_questions()
+    # Each category is an independent file, so process them in parallel
+    with ProcessPoolExecutor(max_workers=len(QUESTION_CONFIGS)) as executor:
+        list(executor.map(process_questions, QUESTION_CONFIGS))